@@ -1,12 +1,12 @@
 """The Vaillant Plus climate platform."""
 from __future__ import annotations
 
+from functools import cached_property
 import logging
 from typing import Any
 
 from homeassistant.components.climate import ClimateEntity
 from homeassistant.components.climate.const import (
-    PRESET_COMFORT,
     ClimateEntityFeature,
     HVACAction,
     HVACMode,
@@ -14,25 +14,56 @@ from homeassistant.components.climate.const import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .client import VaillantClient
 from .const import CONF_DID, DISPATCHERS, DOMAIN, EVT_DEVICE_CONNECTED, API_CLIENT
-from .entity import VaillantEntity
+from .entity import VaillantCacheMixin, VaillantEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_TEMPERATURE_INCREASE = 0.5
-
-PRESET_SUMMER = "Summer"
-PRESET_WINTER = "Winter"
+# Seconds to wait before sending a new target temperature, so that only the
+# last value of a rapid series of changes reaches the device.
+SET_TEMPERATURE_COOLDOWN = 0.4
 
 SUPPORTED_FEATURES = (
     ClimateEntityFeature.TARGET_TEMPERATURE | ClimateEntityFeature.TURN_OFF
 )
 SUPPORTED_HVAC_MODES = [HVACMode.HEAT, HVACMode.OFF]
-SUPPORTED_PRESET_MODES = [PRESET_COMFORT]
+
+# Device attributes backing this entity.
+_HEATING_ENABLE = "Heating_Enable"
+_FLOW_TEMPERATURE_SETPOINT = "Flow_Temperature_Setpoint"
+_LOWER_LIMITATION = "Lower_Limitation_of_CH_Setpoint"
+_UPPER_LIMITATION = "Upper_Limitation_of_CH_Setpoint"
+
+# Position of each tracked attribute in the entity cache; properties index
+# the cache with these directly.
+_HEATING_ENABLE_INDEX = 0
+_FLOW_TEMPERATURE_SETPOINT_INDEX = 1
+_LOWER_LIMITATION_INDEX = 2
+_UPPER_LIMITATION_INDEX = 3
+
+# Device attributes tracked by this entity: the position of each value in the
+# entity cache, and the cached properties derived from it that are invalidated
+# whenever the value changes.
+_TRACKED_ATTRS = {
+    _HEATING_ENABLE: (_HEATING_ENABLE_INDEX, ("hvac_mode", "hvac_action")),
+    _FLOW_TEMPERATURE_SETPOINT: (
+        _FLOW_TEMPERATURE_SETPOINT_INDEX,
+        ("current_temperature", "target_temperature"),
+    ),
+    _LOWER_LIMITATION: (_LOWER_LIMITATION_INDEX, ("min_temp", "target_temperature_low")),
+    _UPPER_LIMITATION: (_UPPER_LIMITATION_INDEX, ("max_temp", "target_temperature_high")),
+}
+_TRACKED_KEYS = frozenset(_TRACKED_ATTRS)
+
+# Heating_Enable is reported as 0/1 or False/True, which hash the same.
+_HVAC_MODE_MAP = {1: HVACMode.HEAT, 0: HVACMode.OFF}
+_HVAC_ACTION_MAP = {1: HVACAction.HEATING, 0: HVACAction.OFF}
 
 
 async def async_setup_entry(
@@ -45,23 +76,20 @@ async def async_setup_entry(
         entry.entry_id
     ]
 
-    added_entities = []
-
     @callback
     def async_new_climate(device_attrs: dict[str, Any]):
-        _LOGGER.debug("New climate found device_attrs == %s",device_attrs)
-
-        if "climate" not in added_entities:
-            if device_attrs.get("Heating_Enable") is not None:
-                new_devices = [VaillantClimate(client)]
-                async_add_devices(new_devices)
-                added_entities.append("climate")
-            else:
-                _LOGGER.warning(
-                    "Missing required attribute to setup Vaillant Climate. skip."
-                )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("New climate found device_attrs == %s", device_attrs)
+
+        if device_attrs.get(_HEATING_ENABLE) is not None:
+            async_add_devices((VaillantClimate(client),))
+            # 实体只需添加一次，添加后立即取消订阅
+            unsub()
+            hass.data[DOMAIN][DISPATCHERS][device_id].remove(unsub)
         else:
-            _LOGGER.debug("Already added climate device. skip.")
+            _LOGGER.warning(
+                "Missing required attribute to setup Vaillant Climate. skip."
+            )
 
     unsub = async_dispatcher_connect(
         hass, EVT_DEVICE_CONNECTED.format(device_id), async_new_climate
@@ -72,22 +100,49 @@ async def async_setup_entry(
     return True
 
 
-class VaillantClimate(VaillantEntity, ClimateEntity):
+class VaillantClimate(VaillantCacheMixin, VaillantEntity, ClimateEntity):
     """Vaillant vSMART Climate."""
-    
+
+    _tracked_attrs = _TRACKED_ATTRS
+    _tracked_keys = _TRACKED_KEYS
+
     def __init__(self, client):
-        self._client = client  # 保存 client 参数
-        self._cache = {}  # 初始化缓存字典
+        super().__init__(client)
+        self._pending_sp: float | None = None
+        # 发送前设备最后上报的温度，发送失败时回滚到该值
+        self._reported_sp: float | None = None
+        self._debouncer: Debouncer | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Register callbacks and set up the target temperature debouncer."""
+        await super().async_added_to_hass()
+
+        self._debouncer = Debouncer(
+            self.hass,
+            _LOGGER,
+            cooldown=SET_TEMPERATURE_COOLDOWN,
+            immediate=False,
+            function=self._async_send_pending_temperature,
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Send a still pending target temperature instead of dropping it."""
+        await super().async_will_remove_from_hass()
+
+        if self._debouncer is not None:
+            self._debouncer.async_cancel()
+            self._debouncer = None
+        await self._async_send_pending_temperature()
 
     @property
     def should_poll(self) -> bool:
         return False
 
-    @property
+    @cached_property
     def unique_id(self) -> str:
         """Return a unique ID to use for this entity."""
 
-        return f"{self.device.id}_climate"
+        return f"{self._device_id}_climate"
 
     @property
     def name(self) -> str | None:
@@ -105,106 +160,48 @@ class VaillantClimate(VaillantEntity, ClimateEntity):
 
         return UnitOfTemperature.CELSIUS
 
-    @property
+    @cached_property
     def current_temperature(self) -> float:
         """Return the current room temperature."""
-        return self._get_cached_value("Flow_Temperature_Setpoint", default=35.0)
+        return self._get_cached_value(_FLOW_TEMPERATURE_SETPOINT_INDEX, 35.0)
 
-    @property
+    @cached_property
     def target_temperature(self) -> float:
         """Return the targeted room temperature."""
-        return self._get_cached_value("Flow_Temperature_Setpoint", default=35.0)
+        return self._get_cached_value(_FLOW_TEMPERATURE_SETPOINT_INDEX, 35.0)
 
     @property
     def hvac_modes(self) -> list[HVACMode]:
         """Return the list of available HVAC operation modes."""
         return SUPPORTED_HVAC_MODES
 
-    @property
+    @cached_property
     def hvac_mode(self) -> HVACMode:
         """
         Return currently selected HVAC operation mode.
-        If Heating_Enable is not available, return the last known value.
+        Based on the last reported Heating_Enable, OFF until it is reported.
         """
-        try:
-            enable = self._get_cached_value("Heating_Enable",HVACMode.OFF)
-            if enable == 1:
-                self._cache["hvac_mode"] = HVACMode.HEAT
-            else:
-                self._cache["hvac_mode"] = HVACMode.OFF
-        except (AttributeError, KeyError):
-            pass  # 如果获取失败，保持上一次的值
+        enable = self._get_cached_value(_HEATING_ENABLE_INDEX)
+        return _HVAC_MODE_MAP.get(enable, HVACMode.OFF)
 
-        return self._cache.get("hvac_mode", HVACMode.OFF)
-
-    @property
+    @cached_property
     def hvac_action(self) -> HVACAction:
         """
         Return the currently running HVAC action.
-        If Heating_Enable is not available, return the last known value.
+        Based on the last reported Heating_Enable, IDLE until it is reported.
         """
-        try:
-            enable = self._get_cached_value("Heating_Enable",False)
-            _LOGGER.debug("enable===%s",enable)
-            if enable == 0:
-                self._cache["hvac_action"] = HVACAction.OFF
-            elif enable == 1:
-                self._cache["hvac_action"] = HVACAction.HEATING
-            else:
-                self._cache["hvac_action"] = HVACAction.IDLE
-        except (AttributeError, KeyError):
-            pass  # 如果获取失败，保持上一次的值
-
-        return self._cache.get("hvac_action", HVACAction.IDLE)
-    
-
-    @property
-    def preset_modes(self) -> list[str]:
-        """Return the list of available HVAC preset modes."""
-
-        return SUPPORTED_PRESET_MODES
-
-    @property
-    def preset_mode(self) -> str:
-        """Return the currently selected HVAC preset mode."""
-
-        return None
+        enable = self._get_cached_value(_HEATING_ENABLE_INDEX)
+        return _HVAC_ACTION_MAP.get(enable, HVACAction.IDLE)
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Select new HVAC operation mode."""
 
         _LOGGER.debug("Setting HVAC mode to: %s", hvac_mode)
 
-        try:
-            if hvac_mode == HVACMode.OFF:
-                await self._client.control_device({"Heating_Enable": False})
-                # Update device_attrs for state persistence
-                self._client.device_attrs["Heating_Enable"] = False
-                # Update cache
-                self._cache["Heating_Enable"] = False
-                self._cache["hvac_mode"] = HVACMode.OFF
-                self._cache["hvac_action"] = HVACAction.OFF
-                # Update HA state
-                self.async_write_ha_state()
-            elif hvac_mode == HVACMode.HEAT:
-                await self._client.control_device({"Heating_Enable": True})
-                # Update device_attrs for state persistence
-                self._client.device_attrs["Heating_Enable"] = True
-                # Update cache
-                self._cache["Heating_Enable"] = True
-                self._cache["hvac_mode"] = HVACMode.HEAT
-                self._cache["hvac_action"] = HVACAction.HEATING
-                # Update HA state
-                self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Failed to set HVAC mode: %s", e)
-
-    async def async_set_preset_mode(self, preset_mode: str) -> None:
-        """Select new HVAC preset mode."""
-
-        _LOGGER.debug("Setting HVAC preset mode to: %s", preset_mode)
-        return None
-    
+        if hvac_mode == HVACMode.OFF:
+            await self._update_device_attribute(_HEATING_ENABLE, False)
+        elif hvac_mode == HVACMode.HEAT:
+            await self._update_device_attribute(_HEATING_ENABLE, True)
 
     async def async_set_temperature(self, **kwargs) -> None:
         """Update target room temperature value."""
@@ -215,96 +212,80 @@ class VaillantClimate(VaillantEntity, ClimateEntity):
 
         _LOGGER.debug("Setting target temperature to: %s", new_temperature)
 
-        await self._client.control_device({
-            "Flow_Temperature_Setpoint": new_temperature,
-        })
+        if self._pending_sp is None:
+            self._reported_sp = self._get_cached_value(_FLOW_TEMPERATURE_SETPOINT_INDEX)
+        self._pending_sp = new_temperature
+
+        # Update device_attrs and HA state optimistically, rolled back if the
+        # device does not accept the new temperature
+        self._client.device_attrs[_FLOW_TEMPERATURE_SETPOINT] = new_temperature
+        self.update_from_latest_data({_FLOW_TEMPERATURE_SETPOINT: new_temperature})
+
+        # 连续调节时只发送冷却时间内的最后一个温度
+        await self._debouncer.async_call()
+
+    async def _async_send_pending_temperature(self) -> None:
+        """Send the most recently requested target temperature to the device."""
+        # 发送期间新设置的温度不会再触发防抖器（其执行锁被占用），在此继续发送
+        while self._pending_sp is not None:
+            new_temperature, self._pending_sp = self._pending_sp, None
+            reported, self._reported_sp = self._reported_sp, None
+            try:
+                accepted = await self._control({
+                    _FLOW_TEMPERATURE_SETPOINT: new_temperature,
+                })
+            except Exception as e:
+                _LOGGER.error("Failed to set target temperature to %s: %s", new_temperature, e)
+                accepted = False
+            else:
+                if not accepted:
+                    _LOGGER.error("Failed to set target temperature to %s", new_temperature)
+
+            if accepted:
+                continue
+
+            if self._pending_sp is not None:
+                # 发送期间又有新的温度待发送，由它在失败时回滚
+                self._reported_sp = reported
+                continue
+
+            self._async_restore_reported_temperature(reported)
+
+    @callback
+    def _async_restore_reported_temperature(self, reported: float | None) -> None:
+        """Roll the optimistic target temperature back to the last reported one."""
+        if reported is None:
+            self._client.device_attrs.pop(_FLOW_TEMPERATURE_SETPOINT, None)
+        else:
+            self._client.device_attrs[_FLOW_TEMPERATURE_SETPOINT] = reported
+
+        self._cache[_FLOW_TEMPERATURE_SETPOINT_INDEX] = reported
+        for name in _TRACKED_ATTRS[_FLOW_TEMPERATURE_SETPOINT][1]:
+            self._invalidate_cached_property(name)
 
-        # Update device_attrs for state persistence
-        self._client.device_attrs["Flow_Temperature_Setpoint"] = new_temperature
-        # Update cache
-        self._cache["Flow_Temperature_Setpoint"] = new_temperature
-        # Update HA state
         self.async_write_ha_state()
 
-    async def async_turn_off(self):
-        """
-        Turn off the climate device.
-        This method sets `Heating_Enable` to False and updates the cached values.
-        """
-        try:
-            await self._client.control_device({"Heating_Enable": False})
-            # Update device_attrs for state persistence
-            self._client.device_attrs["Heating_Enable"] = False
-            # Update cache
-            self._cache["Heating_Enable"] = False
-            self._cache["hvac_mode"] = HVACMode.OFF
-            self._cache["hvac_action"] = HVACAction.OFF
-            # Update HA state
-            self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Failed to turn off the device: %s", e)
- 
-    @property
+    async def async_turn_off(self) -> None:
+        """Turn off the climate device."""
+        await self.async_set_hvac_mode(HVACMode.OFF)
+
+    @cached_property
     def min_temp(self) -> float | None:
         """Return the minimum temperature."""
-        return self._get_cached_value("Lower_Limitation_of_CH_Setpoint", default=30.0)
+        return self._get_cached_value(_LOWER_LIMITATION_INDEX, 30.0)
 
-    @property
+    @cached_property
     def max_temp(self) -> float | None:
         """Return the maximum temperature."""
-        return self._get_cached_value("Upper_Limitation_of_CH_Setpoint", default=75.0)
+        return self._get_cached_value(_UPPER_LIMITATION_INDEX, 75.0)
     
 
-    @property
+    @cached_property
     def target_temperature_high(self) -> float | None:
         """Return the highbound target temperature we try to reach."""
-        return self._get_cached_value("Upper_Limitation_of_CH_Setpoint", default=75.0)
+        return self._get_cached_value(_UPPER_LIMITATION_INDEX, 75.0)
 
-    @property
+    @cached_property
     def target_temperature_low(self) -> float | None:
         """Return the lowbound target temperature we try to reach."""
-        return self._get_cached_value("Lower_Limitation_of_CH_Setpoint", default=30.0)
-    
-    def _get_cached_value(self, attr_name: str, default: float) -> float:
-        """
-        Get a cached value for a device attribute.
-        If the value is not available, return the last known value or a default value.
-        """
-        try:
-            value = self.get_device_attr(attr_name)
-            if value is not None:
-                self._cache[attr_name] = value  # 更新缓存
-        except (AttributeError, KeyError) as e:
-            _LOGGER.debug("Failed to get device attribute %s: %s", attr_name, e)
-            value = None  # 如果获取失败，保持上一次的值
-
-        # 如果当前值为 None 且缓存值不为 None，则返回缓存值
-        if value is None and attr_name in self._cache:
-            return self._cache[attr_name]
-
-        # 如果当前值和缓存值都为 None，则返回默认值
-        return value if value is not None else default
-
-    @callback
-    def update_from_latest_data(self, data: dict[str, Any]) -> None:
-        """Update the climate entity from the latest data."""
-        # 更新缓存中的关键属性，确保控制参数能及时反映外部变更
-        if "Heating_Enable" in data:
-            enable = data["Heating_Enable"]
-            if enable == 1:
-                self._cache["hvac_mode"] = HVACMode.HEAT
-                self._cache["hvac_action"] = HVACAction.HEATING
-            else:
-                self._cache["hvac_mode"] = HVACMode.OFF
-                self._cache["hvac_action"] = HVACAction.OFF
-        
-        if "Flow_Temperature_Setpoint" in data:
-            self._cache["Flow_Temperature_Setpoint"] = data["Flow_Temperature_Setpoint"]
-        
-        if "Lower_Limitation_of_CH_Setpoint" in data:
-            self._cache["Lower_Limitation_of_CH_Setpoint"] = data["Lower_Limitation_of_CH_Setpoint"]
-        
-        if "Upper_Limitation_of_CH_Setpoint" in data:
-            self._cache["Upper_Limitation_of_CH_Setpoint"] = data["Upper_Limitation_of_CH_Setpoint"]
-        
-        self.async_write_ha_state()
+        return self._get_cached_value(_LOWER_LIMITATION_INDEX, 30.0)
@@ -1,7 +1,7 @@
 """Vaillant vSMART entity classes."""
 from datetime import timedelta
 import logging
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 from homeassistant.core import callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
@@ -9,7 +9,7 @@ from homeassistant.helpers.entity import Entity, DeviceInfo
 from vaillant_plus_cn_api import Device
 
 from .client import VaillantClient
-from .const import DOMAIN, EVT_DEVICE_UPDATED
+from .const import DOMAIN, EVT_DEVICE_CONNECTED, EVT_DEVICE_UPDATED
 
 UPDATE_INTERVAL = timedelta(seconds=30)
 
@@ -25,6 +25,8 @@ class VaillantEntity(Entity):
     ):
         """Initialize."""
         self._client = client
+        # 设备在实体创建前已确定，绑定一次设备 ID 避免重复的属性链查找
+        self._device_id = client.device.id
 
     @property
     def device_attrs(self) -> dict[str, Any]:
@@ -34,11 +36,6 @@ class VaillantEntity(Entity):
     def device(self) -> Device:
         return self._client.device
 
-    def get_device_attr(self, attr) -> Any:
-        if self._client.device_attrs.get(attr) is not None:
-            return self._client.device_attrs.get(attr)
-        return None
-        
     def set_device_attr(self, attr, value):
         """
         Set the value of a device attribute.
@@ -58,12 +55,19 @@ class VaillantEntity(Entity):
         @callback
         def update(data: dict[str, Any]) -> None:
             """Update the state."""
-            _LOGGER.debug("write ha state: %s", data)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("write ha state: %s", data)
             self.update_from_latest_data(data)
 
         self.async_on_remove(
             async_dispatcher_connect(
-                self.hass, EVT_DEVICE_UPDATED.format(self.device.id), update
+                self.hass, EVT_DEVICE_UPDATED.format(self._device_id), update
+            )
+        )
+        # 重连后客户端保存的属性快照只通过 EVT_DEVICE_CONNECTED 下发
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, EVT_DEVICE_CONNECTED.format(self._device_id), update
             )
         )
 
@@ -79,7 +83,7 @@ class VaillantEntity(Entity):
         """Return all device info available for this entity."""
 
         return DeviceInfo(
-            identifiers={(DOMAIN, self.device.id)},
+            identifiers={(DOMAIN, self._device_id)},
             name=self.device.product_name,
             model=self.device.model,
             # sw_version=self.device.mcu_soft_version,
@@ -95,6 +99,72 @@ class VaillantEntity(Entity):
 
     async def send_command(self, attr: str, value: Any) -> None:
         """Send operations to cloud."""
-        await self._client.control_device({
-            f"{attr}": value
-        })
+        await self._client.control_device({attr: value})
+
+
+class VaillantCacheMixin:
+    """Cache of tracked device attributes backing an entity's cached properties.
+
+    Subclasses set _tracked_attrs, mapping each device attribute to its position
+    in _cache and the cached properties derived from it, and _tracked_keys.
+    """
+
+    _tracked_attrs: dict[str, tuple[int, tuple[str, ...]]] = {}
+    _tracked_keys: frozenset[str] = frozenset()
+    _cache: list[Any]
+    _control: Callable[[dict[str, Any]], Awaitable[bool]]
+
+    def __init__(self, client: VaillantClient):
+        """Initialize."""
+        super().__init__(client)
+        self._cache = [None] * len(self._tracked_attrs)  # 最近一次上报的设备属性
+        # Bound once to skip the attribute lookup on every command. Any patch of
+        # client.control_device must be in place before the entity is built.
+        self._control = client.control_device
+
+    def _get_cached_value(self, index: int, default: Any = None) -> Any:
+        """Return the last reported value at a cache position, or default."""
+        value = self._cache[index]
+        return default if value is None else value
+
+    def _invalidate_cached_property(self, name: str) -> None:
+        """Drop a cached property value so it is recomputed on next access."""
+        self.__dict__.pop(name, None)
+
+    @callback
+    def update_from_latest_data(self, data: dict[str, Any]) -> None:
+        """Update the cached attributes from the latest data."""
+        # 只让发生变化的属性对应的缓存失效，未上报(None)的属性保持上一次的值
+        changed = {
+            attr_name: data[attr_name]
+            for attr_name in self._tracked_keys & data.keys()
+            if data[attr_name] is not None
+            and self._cache[self._tracked_attrs[attr_name][0]] != data[attr_name]
+        }
+        if not changed:
+            # 属性均未变化，无需重新写入 HA 状态
+            return
+
+        for attr_name, value in changed.items():
+            index, properties = self._tracked_attrs[attr_name]
+            self._cache[index] = value
+            for name in properties:
+                self._invalidate_cached_property(name)
+
+        self.async_write_ha_state()
+
+    async def _update_device_attribute(self, attr_name: str, value: Any) -> None:
+        """
+        Update a device attribute and the cache.
+        """
+        try:
+            if not await self._control({attr_name: value}):
+                # 重试耗尽后设备仍未接受，保持上一次上报的状态
+                _LOGGER.error("Failed to update device attribute %s to %s", attr_name, value)
+                return
+            # Update device_attrs for state persistence
+            self._client.device_attrs[attr_name] = value
+            # Update cache and HA state
+            self.update_from_latest_data({attr_name: value})
+        except Exception as e:
+            _LOGGER.error("Failed to update device attribute %s: %s", attr_name, e)
@@ -130,7 +130,7 @@ async def async_setup_entry(
         entry.entry_id
     ]
 
-    added_entities = []
+    added_entities: set[str] = set()
 
     @callback
     def async_new_entities(device_attrs: dict[str, Any]):
@@ -142,7 +142,7 @@ async def async_setup_entry(
                 and description.key not in added_entities
             ):
                 new_entities.append(VaillantSensorEntity(client, description))
-                added_entities.append(description.key)
+                added_entities.add(description.key)
 
         if len(new_entities) > 0:
             async_add_entities(new_entities)
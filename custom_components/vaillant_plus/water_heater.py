@@ -1,6 +1,7 @@
 """The Vaillant Plus climate platform."""
 from __future__ import annotations
 
+from functools import cached_property
 import logging
 from typing import Any
 
@@ -24,7 +25,7 @@ from .const import (
     WATER_HEATER_ON,
     API_CLIENT,
 )
-from .entity import VaillantEntity
+from .entity import VaillantCacheMixin, VaillantEntity
 
 # from .entity import VaillantCoordinator, VaillantEntity
 
@@ -36,6 +37,31 @@ SUPPORTED_FEATURES = (
     WaterHeaterEntityFeature.TARGET_TEMPERATURE
     | WaterHeaterEntityFeature.OPERATION_MODE
 )
+SUPPORTED_OPERATIONS = [WATER_HEATER_ON, WATER_HEATER_OFF]
+
+# Device attributes backing this entity.
+_TANK_LOADING_ENABLE = "WarmStar_Tank_Loading_Enable"
+_DHW_SETPOINT = "DHW_setpoint"
+_LOWER_LIMITATION = "Lower_Limitation_of_DHW_Setpoint"
+_UPPER_LIMITATION = "Upper_Limitation_of_DHW_Setpoint"
+
+# Position of each tracked attribute in the entity cache; properties index
+# the cache with these directly.
+_TANK_LOADING_ENABLE_INDEX = 0
+_DHW_SETPOINT_INDEX = 1
+_LOWER_LIMITATION_INDEX = 2
+_UPPER_LIMITATION_INDEX = 3
+
+# Device attributes tracked by this entity: the position of each value in the
+# entity cache, and the cached properties derived from it that are invalidated
+# whenever the value changes.
+_TRACKED_ATTRS = {
+    _TANK_LOADING_ENABLE: (_TANK_LOADING_ENABLE_INDEX, ("current_operation",)),
+    _DHW_SETPOINT: (_DHW_SETPOINT_INDEX, ("current_temperature", "target_temperature")),
+    _LOWER_LIMITATION: (_LOWER_LIMITATION_INDEX, ("min_temp", "target_temperature_low")),
+    _UPPER_LIMITATION: (_UPPER_LIMITATION_INDEX, ("max_temp", "target_temperature_high")),
+}
+_TRACKED_KEYS = frozenset(_TRACKED_ATTRS)
 
 
 async def async_setup_entry(
@@ -48,22 +74,19 @@ async def async_setup_entry(
         entry.entry_id
     ]
 
-    added_entities = []
-
     @callback
     def async_new_water_heater(device_attrs: dict[str, Any]):
-        _LOGGER.debug("New water heater found, %s", device_attrs)
-        if "water_heater" not in added_entities:
-            if device_attrs.get("DHW_setpoint") is not None:
-                new_devices = [VaillantWaterHeater(client)]
-                async_add_devices(new_devices)
-                added_entities.append("water_heater")
-            else:
-                _LOGGER.warning(
-                    "Missing required attribute to setup Vaillant Water Heater. skip."
-                )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("New water heater found, %s", device_attrs)
+        if device_attrs.get(_DHW_SETPOINT) is not None:
+            async_add_devices((VaillantWaterHeater(client),))
+            # 实体只需添加一次，添加后立即取消订阅
+            unsub()
+            hass.data[DOMAIN][DISPATCHERS][device_id].remove(unsub)
         else:
-            _LOGGER.debug("Already added water_heater device. skip.")
+            _LOGGER.warning(
+                "Missing required attribute to setup Vaillant Water Heater. skip."
+            )
 
     unsub = async_dispatcher_connect(
         hass, EVT_DEVICE_CONNECTED.format(device_id), async_new_water_heater
@@ -74,21 +97,20 @@ async def async_setup_entry(
     return True
 
 
-class VaillantWaterHeater(VaillantEntity, WaterHeaterEntity):
+class VaillantWaterHeater(VaillantCacheMixin, VaillantEntity, WaterHeaterEntity):
     """Vaillant vSMART Water Heater."""
 
-    def __init__(self, client):
-        self._client = client  # 保存 client 参数
-        self._cache = {}  # 初始化缓存字典
+    _tracked_attrs = _TRACKED_ATTRS
+    _tracked_keys = _TRACKED_KEYS
 
     @property
     def should_poll(self) -> bool:
         return False
 
-    @property
+    @cached_property
     def unique_id(self) -> str:
         """Return a unique ID to use for this entity."""
-        return f"{self.device.id}_water_heater"
+        return f"{self._device_id}_water_heater"
 
     @property
     def name(self) -> str | None:
@@ -110,10 +132,10 @@ class VaillantWaterHeater(VaillantEntity, WaterHeaterEntity):
         """Return the measurement unit for all temperature values."""
         return UnitOfTemperature.CELSIUS
 
-    @property
+    @cached_property
     def current_operation(self) -> str | None:
         """Return current operation ie. eco, electric, performance, ..."""
-        value = self._get_cached_value("WarmStar_Tank_Loading_Enable")
+        value = self._get_cached_value(_TANK_LOADING_ENABLE_INDEX)
         if value is None:
             return None
         return WATER_HEATER_ON if value == 1 else WATER_HEATER_OFF
@@ -121,27 +143,27 @@ class VaillantWaterHeater(VaillantEntity, WaterHeaterEntity):
     @property
     def operation_list(self) -> list[str] | None:
         """Return the list of available operation modes."""
-        return [WATER_HEATER_ON, WATER_HEATER_OFF]
+        return SUPPORTED_OPERATIONS
 
-    @property
+    @cached_property
     def current_temperature(self) -> float:
         """Return the current dhw temperature."""
-        return self._get_cached_value("DHW_setpoint")
+        return self._get_cached_value(_DHW_SETPOINT_INDEX)
 
-    @property
+    @cached_property
     def target_temperature(self) -> float:
         """Return the targeted dhw temperature. Current_DHW_Setpoint or DHW_setpoint"""
-        return self._get_cached_value("DHW_setpoint")
+        return self._get_cached_value(_DHW_SETPOINT_INDEX)
 
-    @property
+    @cached_property
     def target_temperature_high(self) -> float | None:
         """Return the highbound target temperature we try to reach."""
-        return self._get_cached_value("Upper_Limitation_of_DHW_Setpoint")
+        return self._get_cached_value(_UPPER_LIMITATION_INDEX)
 
-    @property
+    @cached_property
     def target_temperature_low(self) -> float | None:
         """Return the lowbound target temperature we try to reach."""
-        return self._get_cached_value("Lower_Limitation_of_DHW_Setpoint")
+        return self._get_cached_value(_LOWER_LIMITATION_INDEX)
 
     async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new target temperature."""
@@ -151,7 +173,7 @@ class VaillantWaterHeater(VaillantEntity, WaterHeaterEntity):
 
         _LOGGER.debug("Setting target temperature to: %s", new_temperature)
 
-        await self._update_device_attribute("DHW_setpoint", new_temperature)
+        await self._update_device_attribute(_DHW_SETPOINT, new_temperature)
 
     async def async_set_operation_mode(self, operation_mode: str) -> None:
         """Set new target operation mode."""
@@ -159,67 +181,14 @@ class VaillantWaterHeater(VaillantEntity, WaterHeaterEntity):
 
         _LOGGER.debug("Setting operation mode to: %s", operation_mode)
 
-        await self._update_device_attribute("WarmStar_Tank_Loading_Enable", value)
+        await self._update_device_attribute(_TANK_LOADING_ENABLE, value)
 
-    @property
+    @cached_property
     def min_temp(self) -> float:
         """Return the minimum temperature."""
-        return self._get_cached_value("Lower_Limitation_of_DHW_Setpoint")
+        return self._get_cached_value(_LOWER_LIMITATION_INDEX)
 
-    @property
+    @cached_property
     def max_temp(self) -> float:
         """Return the maximum temperature."""
-        return self._get_cached_value("Upper_Limitation_of_DHW_Setpoint")
-
-    def _get_cached_value(self, attr_name: str, default: Any = None) -> Any:
-        """
-        Get a cached value for a device attribute.
-        If the value is not available, return the last known value or a default value.
-        """
-        try:
-            value = self.get_device_attr(attr_name)
-            if value is not None:
-                self._cache[attr_name] = value  # 更新缓存
-        except (AttributeError, KeyError) as e:
-            _LOGGER.debug("Failed to get device attribute %s: %s", attr_name, e)
-            value = None  # 如果获取失败，保持上一次的值
-
-        # 如果当前值为 None 且缓存值不为 None，则返回缓存值
-        if value is None and attr_name in self._cache:
-            return self._cache[attr_name]
-
-        # 如果当前值和缓存值都为 None，则返回默认值
-        return value if value is not None else default
-
-    @callback
-    def update_from_latest_data(self, data: dict[str, Any]) -> None:
-        """Update the water heater entity from the latest data."""
-        # 更新缓存中的关键属性，确保控制参数能及时反映外部变更
-        if "WarmStar_Tank_Loading_Enable" in data:
-            self._cache["WarmStar_Tank_Loading_Enable"] = data["WarmStar_Tank_Loading_Enable"]
-        
-        if "DHW_setpoint" in data:
-            self._cache["DHW_setpoint"] = data["DHW_setpoint"]
-        
-        if "Lower_Limitation_of_DHW_Setpoint" in data:
-            self._cache["Lower_Limitation_of_DHW_Setpoint"] = data["Lower_Limitation_of_DHW_Setpoint"]
-        
-        if "Upper_Limitation_of_DHW_Setpoint" in data:
-            self._cache["Upper_Limitation_of_DHW_Setpoint"] = data["Upper_Limitation_of_DHW_Setpoint"]
-        
-        self.async_write_ha_state()
-
-    async def _update_device_attribute(self, attr_name: str, value: Any) -> None:
-        """
-        Update a device attribute and the cache.
-        """
-        try:
-            await self.send_command(attr_name, value)
-            # Update device_attrs for state persistence
-            self._client.device_attrs[attr_name] = value
-            # Update cache
-            self._cache[attr_name] = value
-            # Update HA state
-            self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error("Failed to update device attribute %s: %s", attr_name, e)
+        return self._get_cached_value(_UPPER_LIMITATION_INDEX)
@@ -1,43 +1,59 @@
 """Test vaillant-plus climate."""
+import asyncio
+from datetime import timedelta
+from functools import cached_property
 from unittest.mock import patch
 
-from homeassistant.components.climate.const import PRESET_COMFORT, PRESET_ECO, HVACMode
+from homeassistant.components.climate.const import HVACAction, HVACMode
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
-from custom_components.vaillant_plus.climate import VaillantClimate
+from custom_components.vaillant_plus.climate import (
+    _TRACKED_ATTRS,
+    SET_TEMPERATURE_COOLDOWN,
+    VaillantClimate,
+)
 
 
-async def test_climate_actions(hass, device_api_client):
-    """Test binary sensor."""
-    climate = VaillantClimate(
-        device_api_client,
+async def _async_add_climate(hass, device_api_client) -> VaillantClimate:
+    """Create a climate entity and run its add-to-hass hook."""
+    climate = VaillantClimate(device_api_client)
+    climate.hass = hass
+    climate.entity_id = "climate.vaillant"
+    await climate.async_added_to_hass()
+    return climate
+
+
+async def _async_finish_cooldown(hass) -> None:
+    """Let the target temperature debouncer fire."""
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SET_TEMPERATURE_COOLDOWN + 1)
     )
+    await hass.async_block_till_done()
 
-    assert climate.unique_id == "1_climate"
-    assert climate.should_poll is False
-    assert climate.name is None
 
+async def test_climate_actions(hass, device_api_client):
+    """Test climate actions."""
     with patch(
-        "custom_components.vaillant_plus.VaillantClient.control_device"
+        "custom_components.vaillant_plus.VaillantClient.control_device",
+        return_value=True,
     ) as send_command_func:
-        await climate.async_set_temperature()
-        send_command_func.assert_not_called()
-        send_command_func.assert_not_awaited()
+        # control_device is bound when the entity is created
+        climate = await _async_add_climate(hass, device_api_client)
 
-        await climate.async_set_preset_mode(PRESET_COMFORT)
-        send_command_func.assert_not_called()
-        send_command_func.assert_not_awaited()
+        assert climate.unique_id == "1_climate"
+        assert climate.should_poll is False
+        assert climate.name is None
 
-        assert climate.preset_mode == PRESET_COMFORT
-
-        await climate.async_set_preset_mode(PRESET_ECO)
+        await climate.async_set_temperature()
+        await _async_finish_cooldown(hass)
         send_command_func.assert_not_called()
         send_command_func.assert_not_awaited()
 
-        assert climate.preset_mode == PRESET_COMFORT
-
         await climate.async_set_temperature(temperature=30)
+        await _async_finish_cooldown(hass)
         send_command_func.assert_awaited_with({
-            "Room_Temperature_Setpoint_Comfort": 30,
+            "Flow_Temperature_Setpoint": 30,
         })
 
         await climate.async_set_hvac_mode(HVACMode.OFF)
@@ -47,6 +63,169 @@ async def test_climate_actions(hass, device_api_client):
 
         await climate.async_set_hvac_mode(HVACMode.HEAT)
         send_command_func.assert_awaited_with({
-            "Heating_Enable": True,
-            "Mode_Setting_CH": "Cruising",
+            "Heating_Enable": True
+        })
+
+        await climate.async_will_remove_from_hass()
+
+
+async def test_climate_set_temperature_debounced(hass, device_api_client):
+    """Test rapid target temperature changes are sent as one command."""
+    with patch(
+        "custom_components.vaillant_plus.VaillantClient.control_device",
+        return_value=True,
+    ) as send_command_func:
+        climate = await _async_add_climate(hass, device_api_client)
+
+        await climate.async_set_temperature(temperature=40)
+        await climate.async_set_temperature(temperature=41)
+        await climate.async_set_temperature(temperature=42)
+        send_command_func.assert_not_awaited()
+        assert climate.target_temperature == 42
+
+        await _async_finish_cooldown(hass)
+        send_command_func.assert_awaited_once_with({
+            "Flow_Temperature_Setpoint": 42,
+        })
+        assert climate.target_temperature == 42
+
+        await climate.async_will_remove_from_hass()
+        send_command_func.assert_awaited_once()
+
+
+async def test_climate_set_temperature_during_send(hass, device_api_client):
+    """Test a target temperature set while a command is in flight is sent."""
+    release = asyncio.Event()
+    sent = []
+
+    async def control_device(attrs):
+        sent.append(attrs)
+        await release.wait()
+        return True
+
+    with patch(
+        "custom_components.vaillant_plus.VaillantClient.control_device",
+        side_effect=control_device,
+    ):
+        climate = await _async_add_climate(hass, device_api_client)
+
+        await climate.async_set_temperature(temperature=40)
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=SET_TEMPERATURE_COOLDOWN + 1)
+        )
+        # The send blocks, so wait for it to start instead of for all tasks
+        for _ in range(10):
+            if sent:
+                break
+            await asyncio.sleep(0)
+        assert sent == [{"Flow_Temperature_Setpoint": 40}]
+
+        await climate.async_set_temperature(temperature=45)
+        release.set()
+        await _async_finish_cooldown(hass)
+        assert sent == [
+            {"Flow_Temperature_Setpoint": 40},
+            {"Flow_Temperature_Setpoint": 45},
+        ]
+        assert climate.target_temperature == 45
+        assert climate._pending_sp is None
+
+        await climate.async_will_remove_from_hass()
+        assert len(sent) == 2
+
+
+async def test_climate_set_temperature_rolled_back(hass, device_api_client):
+    """Test a target temperature the device rejects is rolled back."""
+    with patch(
+        "custom_components.vaillant_plus.VaillantClient.control_device",
+        return_value=False,
+    ) as send_command_func:
+        climate = await _async_add_climate(hass, device_api_client)
+        climate.update_from_latest_data({"Flow_Temperature_Setpoint": 45})
+
+        await climate.async_set_temperature(temperature=50)
+        assert climate.target_temperature == 50
+
+        await _async_finish_cooldown(hass)
+        send_command_func.assert_awaited_once_with({
+            "Flow_Temperature_Setpoint": 50,
+        })
+        assert climate.target_temperature == 45
+        assert device_api_client.device_attrs["Flow_Temperature_Setpoint"] == 45
+
+        await climate.async_will_remove_from_hass()
+
+
+async def test_climate_pending_temperature_sent_on_remove(hass, device_api_client):
+    """Test a debounced target temperature is sent when the entity is removed."""
+    with patch(
+        "custom_components.vaillant_plus.VaillantClient.control_device",
+        return_value=True,
+    ) as send_command_func:
+        climate = await _async_add_climate(hass, device_api_client)
+
+        await climate.async_set_temperature(temperature=42)
+        send_command_func.assert_not_awaited()
+
+        await climate.async_will_remove_from_hass()
+        send_command_func.assert_awaited_once_with({
+            "Flow_Temperature_Setpoint": 42,
+        })
+
+
+async def test_climate_update_from_latest_data(hass, device_api_client):
+    """Test pushed changes refresh every cached property exactly once."""
+    # Every cached state property must be invalidated by some tracked attribute
+    cached_properties = {
+        name
+        for name, value in vars(VaillantClimate).items()
+        if isinstance(value, cached_property) and name != "unique_id"
+    }
+    assert cached_properties == {
+        name for _, properties in _TRACKED_ATTRS.values() for name in properties
+    }
+
+    climate = VaillantClimate(device_api_client)
+
+    with patch.object(climate, "async_write_ha_state") as write_state:
+        climate.update_from_latest_data({
+            "Heating_Enable": 0,
+            "Flow_Temperature_Setpoint": 40,
+            "Lower_Limitation_of_CH_Setpoint": 30,
+            "Upper_Limitation_of_CH_Setpoint": 70,
+        })
+        assert climate.hvac_mode == HVACMode.OFF
+        assert climate.hvac_action == HVACAction.OFF
+        assert climate.current_temperature == 40
+        assert climate.target_temperature == 40
+        assert climate.min_temp == 30
+        assert climate.target_temperature_low == 30
+        assert climate.max_temp == 70
+        assert climate.target_temperature_high == 70
+        assert write_state.call_count == 1
+
+        climate.update_from_latest_data({
+            "Heating_Enable": 1,
+            "Flow_Temperature_Setpoint": 45,
+            "Lower_Limitation_of_CH_Setpoint": 35,
+            "Upper_Limitation_of_CH_Setpoint": 75,
+        })
+        assert climate.hvac_mode == HVACMode.HEAT
+        assert climate.hvac_action == HVACAction.HEATING
+        assert climate.current_temperature == 45
+        assert climate.target_temperature == 45
+        assert climate.min_temp == 35
+        assert climate.target_temperature_low == 35
+        assert climate.max_temp == 75
+        assert climate.target_temperature_high == 75
+        assert write_state.call_count == 2
+
+        climate.update_from_latest_data({
+            "Heating_Enable": 1,
+            "Flow_Temperature_Setpoint": 45,
+            "Lower_Limitation_of_CH_Setpoint": 35,
+            "Upper_Limitation_of_CH_Setpoint": 75,
         })
+        climate.update_from_latest_data({"Flow_Temperature_Setpoint": None})
+        assert climate.target_temperature == 45
+        assert write_state.call_count == 2
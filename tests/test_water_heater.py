@@ -1,23 +1,28 @@
 """Test vaillant-plus climate."""
+from functools import cached_property
 from unittest.mock import patch
 
 from custom_components.vaillant_plus.const import WATER_HEATER_OFF, WATER_HEATER_ON
-from custom_components.vaillant_plus.water_heater import VaillantWaterHeater
+from custom_components.vaillant_plus.water_heater import (
+    _TRACKED_ATTRS,
+    VaillantWaterHeater,
+)
 
 
 async def test_water_heater_actions(hass, device_api_client):
     """Test binary sensor."""
-    water_heater = VaillantWaterHeater(
-        device_api_client,
-    )
-
-    assert water_heater.unique_id == "1_water_heater"
-    assert water_heater.should_poll is False
-    assert water_heater.name is None
-
     with patch(
         "custom_components.vaillant_plus.VaillantClient.control_device"
     ) as send_command_func:
+        # control_device is bound when the entity is created
+        water_heater = VaillantWaterHeater(
+            device_api_client,
+        )
+
+        assert water_heater.unique_id == "1_water_heater"
+        assert water_heater.should_poll is False
+        assert water_heater.name is None
+
         await water_heater.async_set_temperature()
         send_command_func.assert_not_called()
         send_command_func.assert_not_awaited()
@@ -36,3 +41,59 @@ async def test_water_heater_actions(hass, device_api_client):
         send_command_func.assert_awaited_with({
             "DHW_setpoint": 30,
         })
+
+
+async def test_water_heater_update_from_latest_data(hass, device_api_client):
+    """Test pushed changes refresh every cached property exactly once."""
+    # Every cached state property must be invalidated by some tracked attribute
+    cached_properties = {
+        name
+        for name, value in vars(VaillantWaterHeater).items()
+        if isinstance(value, cached_property) and name != "unique_id"
+    }
+    assert cached_properties == {
+        name for _, properties in _TRACKED_ATTRS.values() for name in properties
+    }
+
+    water_heater = VaillantWaterHeater(device_api_client)
+
+    with patch.object(water_heater, "async_write_ha_state") as write_state:
+        water_heater.update_from_latest_data({
+            "WarmStar_Tank_Loading_Enable": 0,
+            "DHW_setpoint": 40,
+            "Lower_Limitation_of_DHW_Setpoint": 35,
+            "Upper_Limitation_of_DHW_Setpoint": 60,
+        })
+        assert water_heater.current_operation == WATER_HEATER_OFF
+        assert water_heater.current_temperature == 40
+        assert water_heater.target_temperature == 40
+        assert water_heater.min_temp == 35
+        assert water_heater.target_temperature_low == 35
+        assert water_heater.max_temp == 60
+        assert water_heater.target_temperature_high == 60
+        assert write_state.call_count == 1
+
+        water_heater.update_from_latest_data({
+            "WarmStar_Tank_Loading_Enable": 1,
+            "DHW_setpoint": 50,
+            "Lower_Limitation_of_DHW_Setpoint": 38,
+            "Upper_Limitation_of_DHW_Setpoint": 65,
+        })
+        assert water_heater.current_operation == WATER_HEATER_ON
+        assert water_heater.current_temperature == 50
+        assert water_heater.target_temperature == 50
+        assert water_heater.min_temp == 38
+        assert water_heater.target_temperature_low == 38
+        assert water_heater.max_temp == 65
+        assert water_heater.target_temperature_high == 65
+        assert write_state.call_count == 2
+
+        water_heater.update_from_latest_data({
+            "WarmStar_Tank_Loading_Enable": 1,
+            "DHW_setpoint": 50,
+            "Lower_Limitation_of_DHW_Setpoint": 38,
+            "Upper_Limitation_of_DHW_Setpoint": 65,
+        })
+        water_heater.update_from_latest_data({"DHW_setpoint": None})
+        assert water_heater.target_temperature == 50
+        assert write_state.call_count == 2